@@ -6,11 +6,22 @@ To run: streamlit run recipe_finder_app.py
 """
 
 import streamlit as st
-import json
+import numpy as np
+import orjson
 import re
 import base64
+import hashlib
+import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from glob import escape as glob_escape
 from pathlib import Path
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import OSA
 from urllib.parse import quote
 
 # Page config
@@ -32,12 +43,39 @@ st.set_page_config(
 # Leave empty to use local PDFs from the 'pdfs/' folder instead
 ONEDRIVE_SHARE_LINK = "https://1drv.ms/f/c/dfbdab8e14325b0e/IgAOWzIUjqu9IIDfDfUBAAAAAW1NBapKYLKoqEEY5TeeV3Q?e=ypNjBX"
 
+# How long (seconds) a OneDrive folder listing is reused
+ONEDRIVE_LISTING_TTL = 3600
+
 # For local PDF fallback
 PDF_FOLDER = "pdfs"
+
+# Downloaded OneDrive PDFs are kept here so they survive cache expiry and restarts
+PDF_CACHE_FOLDER = ".pdf_cache"
+
+# Number of recipe cards rendered per "Show more" page
+RESULTS_PAGE_SIZE = 20
+
+# Number of top search results whose PDFs are downloaded in the background
+PREFETCH_COUNT = 5
 # =============================================================================
 
+# Paths resolved once relative to this file
+_APP_DIR = Path(__file__).resolve().parent
+_JSON_PATH = _APP_DIR / "recipes_data.json"
+_PDF_DIR = _APP_DIR / PDF_FOLDER
+_PDF_CACHE_DIR = _APP_DIR / PDF_CACHE_FOLDER
+
+# Characters stripped out when normalizing ingredient text
+_NORM_RE = re.compile(r'[^a-z ]')
+
+# Minimum fuzz.ratio score for a misspelled word to match a recipe word
+FUZZY_MATCH_CUTOFF = 85
+
+# Shortest misspelled word that may also match with one edit or letter swap
+TYPO_MIN_LENGTH = 5
+
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -88,7 +126,11 @@ st.markdown("""
         text-align: center;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit clears any element a rerun doesn't emit again, so the styles
+# have to be sent on every run rather than once per session
+st.markdown(_CSS, unsafe_allow_html=True)
 
 
 def encode_onedrive_share_link(share_url):
@@ -100,39 +142,110 @@ def encode_onedrive_share_link(share_url):
     return 'u!' + encoded.rstrip('=')
 
 
-@st.cache_data(ttl=3600)
-def get_onedrive_folder_contents():
-    """Get list of files in the shared OneDrive folder."""
-    if not ONEDRIVE_SHARE_LINK:
-        return {}
+@st.cache_resource
+def _http_session():
+    """Shared HTTP session so OneDrive requests reuse keep-alive connections."""
+    session = requests.Session()
+    session.headers['User-Agent'] = 'recipe-finder'
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount('https://', adapter)
+    return session
 
-    try:
-        share_link = ONEDRIVE_SHARE_LINK.strip().split('?')[0]  # Remove query params
-        encoded = encode_onedrive_share_link(share_link)
 
-        # Get folder contents
-        api_url = f"https://api.onedrive.com/v1.0/shares/{encoded}/driveItem/children"
+def list_onedrive_folder(session):
+    """List the PDFs in the shared OneDrive folder.
+
+    Returns a mapping of filename -> (download URL, content tag). Makes no
+    Streamlit calls, so it is safe on worker threads; network and parsing
+    errors propagate to the caller.
+    """
+    share_link = ONEDRIVE_SHARE_LINK.strip().split('?')[0]  # Remove query params
+    encoded = encode_onedrive_share_link(share_link)
+
+    # Get folder contents
+    api_url = f"https://api.onedrive.com/v1.0/shares/{encoded}/driveItem/children"
+
+    response = session.get(api_url, timeout=30)
+    if response.status_code != 200:
+        return {}
+    data = response.json()
+
+    file_map = {}
+    # Large folders are paged; fetch the next page while parsing this one
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        while True:
+            next_link = data.get('@odata.nextLink')
+            next_page = pool.submit(session.get, next_link, timeout=30) if next_link else None
 
-        response = requests.get(api_url, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            # Create a mapping of filename -> download URL
-            file_map = {}
             for item in data.get('value', []):
                 if item.get('name', '').lower().endswith('.pdf'):
                     # Get the download URL from @microsoft.graph.downloadUrl
                     download_url = item.get('@microsoft.graph.downloadUrl') or item.get('@content.downloadUrl')
                     if download_url:
-                        file_map[item['name']] = download_url
-            return file_map
-        else:
-            return {}
+                        # cTag changes whenever the file content changes
+                        file_map[item['name']] = (download_url, item.get('cTag') or item.get('eTag') or '')
+
+            if next_page is None:
+                break
+            response = next_page.result()
+            if response.status_code != 200:
+                break
+            data = response.json()
+
+    return file_map
+
+
+@st.cache_data(ttl=ONEDRIVE_LISTING_TTL)
+def get_onedrive_folder_contents():
+    """Get list of files in the shared OneDrive folder."""
+    if not ONEDRIVE_SHARE_LINK:
+        return {}
+
+    try:
+        return list_onedrive_folder(_http_session())
     except Exception as e:
         st.error(f"Error listing OneDrive folder: {e}")
         return {}
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+def pdf_cache_path(filename, ctag):
+    """Path of the on-disk cache entry for a given version of a OneDrive PDF."""
+    stem = Path(filename).stem
+    version = hashlib.sha1(ctag.encode()).hexdigest()[:12]
+    return _PDF_CACHE_DIR / f"{stem}-{version}.pdf"
+
+
+def store_cached_pdf(cache_path, pdf_bytes):
+    """Write a downloaded PDF to the disk cache, replacing older versions."""
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        stem = cache_path.stem.rsplit('-', 1)[0]
+        for old in cache_path.parent.glob(f"{glob_escape(stem)}-{'[0-9a-f]' * 12}.pdf"):
+            if old != cache_path:
+                old.unlink(missing_ok=True)
+        # Write to a per-thread temp file first so readers never see a
+        # partial PDF, even when a prefetch and a click download it together
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}-{threading.get_ident()}.part")
+        tmp_path.write_bytes(pdf_bytes)
+        tmp_path.replace(cache_path)
+    except OSError:
+        # The disk cache is only an optimization; ignore write failures
+        pass
+
+
+def find_onedrive_entry(file_map, filename):
+    """Look up a file's (download URL, content tag) in the folder listing."""
+    entry = file_map.get(filename)
+
+    if not entry:
+        # Try case-insensitive match
+        for name, value in file_map.items():
+            if name.lower() == filename.lower():
+                return value
+
+    return entry
+
+
 def fetch_pdf_from_onedrive(filename):
     """Fetch PDF content from OneDrive."""
     if not ONEDRIVE_SHARE_LINK:
@@ -141,22 +254,25 @@ def fetch_pdf_from_onedrive(filename):
     # First, try to get the direct download URL from folder listing
     file_map = get_onedrive_folder_contents()
 
-    download_url = file_map.get(filename)
-
-    if not download_url:
-        # Try case-insensitive match
-        for name, url in file_map.items():
-            if name.lower() == filename.lower():
-                download_url = url
-                break
+    entry = find_onedrive_entry(file_map, filename)
 
-    if not download_url:
+    if not entry:
         st.warning(f"File '{filename}' not found in OneDrive folder. Available: {len(file_map)} files")
         return None
 
+    download_url, ctag = entry
+
+    # Serve from the local disk cache if this version was downloaded before
+    cache_path = pdf_cache_path(filename, ctag)
+    try:
+        return cache_path.read_bytes()
+    except OSError:
+        pass
+
     try:
-        response = requests.get(download_url, timeout=60, allow_redirects=True)
+        response = _http_session().get(download_url, timeout=60, allow_redirects=True)
         if response.status_code == 200:
+            store_cached_pdf(cache_path, response.content)
             return response.content
         else:
             st.error(f"Failed to download PDF: HTTP {response.status_code}")
@@ -166,70 +282,234 @@ def fetch_pdf_from_onedrive(filename):
         return None
 
 
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)  # Cache for 1 hour
+def fetch_pdf_html_from_onedrive(filename):
+    """Fetch a PDF from OneDrive and return it as embeddable iframe HTML."""
+    pdf_bytes = fetch_pdf_from_onedrive(filename)
+    if not pdf_bytes:
+        return None
+    return pdf_iframe_html(pdf_bytes)
+
+
+@st.cache_resource
+def _prefetch_pool():
+    """Thread pool shared across reruns for background PDF downloads."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def download_pdf_to_cache(session, download_url, cache_path):
+    """Download a PDF into the disk cache without using any Streamlit APIs.
+
+    Runs on prefetch worker threads, which have no script context. Failures
+    are dropped; the user's click then does a normal fetch and reports them.
+    """
+    if cache_path.exists():
+        return
+
+    try:
+        response = session.get(download_url, timeout=60, allow_redirects=True)
+    except requests.exceptions.RequestException:
+        return
+    if response.status_code == 200:
+        store_cached_pdf(cache_path, response.content)
+
+
+@st.cache_resource
+def _prefetch_listing():
+    """Folder listing shared by prefetch workers, refreshed like the cached one."""
+    return {'file_map': None, 'fetched_at': 0.0}
+
+
+def prefetch_pdfs_to_cache(session, pool, listing, filenames):
+    """List the OneDrive folder if needed and queue the PDF downloads.
+
+    Runs on a prefetch worker so a search never waits on OneDrive, and makes
+    no Streamlit calls; a failed listing just skips this prefetch.
+    """
+    if listing['file_map'] is None or time.monotonic() - listing['fetched_at'] > ONEDRIVE_LISTING_TTL:
+        try:
+            file_map = list_onedrive_folder(session)
+        except Exception:
+            return
+        if not file_map:
+            return
+        listing['file_map'] = file_map
+        listing['fetched_at'] = time.monotonic()
+
+    for filename in filenames:
+        entry = find_onedrive_entry(listing['file_map'], filename)
+        if entry:
+            download_url, ctag = entry
+            pool.submit(download_pdf_to_cache, session, download_url, pdf_cache_path(filename, ctag))
+
+
+def prefetch_recipe_pdfs(matches):
+    """Warm the OneDrive PDF disk cache for the top search results.
+
+    Listing and downloads run in the background so clicking "View Recipe"
+    on one of them reads from disk. Each result set is only prefetched once.
+    """
+    if not ONEDRIVE_SHARE_LINK:
+        return
+
+    filenames = tuple(m['filename'] for m in matches[:PREFETCH_COUNT])
+    if st.session_state.get('prefetched') == filenames:
+        return
+    st.session_state.prefetched = filenames
+
+    # Resolve the cached resources here, on the script thread
+    pool = _prefetch_pool()
+    pool.submit(prefetch_pdfs_to_cache, _http_session(), pool, _prefetch_listing(), filenames)
+
+
 @st.cache_data
 def load_recipes():
     """Load recipe data from JSON file."""
-    json_path = Path(__file__).parent / "recipes_data.json"
-
-    if not json_path.exists():
-        st.error(f"Recipe data not found at {json_path}")
+    if not _JSON_PATH.exists():
+        st.error(f"Recipe data not found at {_JSON_PATH}")
         return []
 
-    with open(json_path, 'r') as f:
-        return json.load(f)
+    with open(_JSON_PATH, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+@st.cache_resource
+def load_search_index():
+    """Build the search structures for the loaded recipes.
 
+    Returns the recipes (with normalized strings and word sets added), a
+    vocabulary mapping each ingredient word to a column number, and a
+    boolean recipe x word matrix marking which words each recipe uses.
+    Held in cache_resource so reruns get the same objects, not a copy;
+    callers must treat them as read-only.
+    """
+    recipes = load_recipes()
+
+    for recipe in recipes:
+        recipe['ingredients_normalized_clean'] = [
+            normalize_text(ing) for ing in recipe.get('ingredients_normalized', [])
+        ]
+        recipe['ing_token_sets'] = [
+            frozenset(w for w in ing.split() if len(w) >= 2)
+            for ing in recipe['ingredients_normalized_clean']
+        ]
+
+    # Build the word presence matrix once, so searches are vectorized
+    all_words = set()
+    for recipe in recipes:
+        all_words.update(*recipe['ing_token_sets'])
+    vocab = {word: col for col, word in enumerate(sorted(all_words))}
 
+    matrix = np.zeros((len(recipes), len(vocab)), dtype=bool)
+    for i, recipe in enumerate(recipes):
+        cols = [vocab[word] for tokens in recipe['ing_token_sets'] for word in tokens]
+        matrix[i, cols] = True
+
+    return recipes, vocab, matrix
+
+
+@lru_cache(maxsize=100_000)
 def normalize_text(text):
     """Normalize text for matching."""
     if not text:
         return ''
-    return re.sub(r'[^a-z ]', '', text.lower()).strip()
-
+    return _NORM_RE.sub('', text.lower()).strip()
 
-def ingredient_matches(user_ing, recipe_ing):
-    """Check if user ingredient matches a recipe ingredient."""
-    user = normalize_text(user_ing)
-    recipe = normalize_text(recipe_ing)
 
-    if not user or not recipe:
-        return False
-
-    # Direct contains match
-    if user in recipe or recipe in user:
-        return True
+def user_tokens(vocab, user_ing):
+    """Expand a user ingredient into the vocabulary words it matches.
 
-    # Word-level match
-    user_words = [w for w in user.split() if len(w) >= 3]
-    recipe_words = [w for w in recipe.split() if len(w) >= 2]
+    A user word (3+ letters) matches any recipe word it contains or is
+    contained in, so "chick" picks up "chicken". A word with no such match
+    falls back to close spellings, so "chiken" does too. Returns None when the ingredient
+    has no words long enough to look up.
+    """
+    user_words = [w for w in normalize_text(user_ing).split() if len(w) >= 3]
+    if not user_words:
+        return None
 
+    tokens = set()
     for uw in user_words:
-        for rw in recipe_words:
-            if uw in rw or rw in uw:
-                return True
-
-    return False
+        matches = {word for word in vocab if uw in word or word in uw}
+        # A word sharing no substring with a real (3+ letter) recipe word is
+        # a typo; 2-letter hits like "on" in "onoin" don't count. Scoring
+        # correct words too would pull in "pears" for "peas"
+        if not any(len(word) >= 3 for word in matches):
+            matches |= {
+                word for word, _, _ in process.extract(
+                    uw, vocab.keys(), scorer=fuzz.ratio,
+                    score_cutoff=FUZZY_MATCH_CUTOFF, limit=None
+                )
+            }
+            # fuzz.ratio scores a swap of two letters ("onoin") as two edits,
+            # so also accept a single edit or swap in longer words
+            if len(uw) >= TYPO_MIN_LENGTH:
+                matches |= {
+                    word for word, _, _ in process.extract(
+                        uw, vocab.keys(), scorer=OSA.distance,
+                        score_cutoff=1, limit=None
+                    )
+                }
+        tokens |= matches
+    return frozenset(tokens)
+
+
+def ingredient_matches(user, tokens, recipe, recipe_tokens):
+    """Check if user ingredient matches a recipe ingredient.
+
+    `tokens` comes from user_tokens(); `recipe` and `recipe_tokens` are the
+    precomputed normalized string and word set from load_search_index.
+    """
+    if tokens is not None:
+        return not tokens.isdisjoint(recipe_tokens)
+
+    # No words to look up (e.g. "ol"), fall back to a direct contains match
+    if not user or not recipe:
+        return False
+    return user in recipe or recipe in user
 
 
-def find_matching_recipes(recipes, user_ingredients):
+def find_matching_recipes(recipes, vocab, matrix, user_ingredients):
     """Find recipes containing ALL user ingredients."""
     if not user_ingredients:
         return []
 
+    queries = [
+        (normalize_text(user_ing), user_tokens(vocab, user_ing))
+        for user_ing in user_ingredients
+    ]
+
+    # Bail out early if some ingredient matches no word in any recipe (typos)
+    if any(tokens is not None and not tokens for _, tokens in queries):
+        return []
+
+    # Narrow down to recipes that share a word with every user ingredient
+    masks = [
+        matrix[:, [vocab[word] for word in tokens]].any(axis=1)
+        for _, tokens in queries
+        if tokens is not None
+    ]
+    if masks:
+        candidates = np.flatnonzero(np.logical_and.reduce(masks))
+        recipes = [recipes[i] for i in candidates]
+
     results = []
 
     for recipe in recipes:
         normalized = recipe.get('ingredients_normalized', [])
         if not normalized:
             continue
+        cleaned = recipe['ingredients_normalized_clean']
+        token_sets = recipe['ing_token_sets']
 
         # Check if recipe has ALL user ingredients
         matched = []
         has_all = True
 
-        for user_ing in user_ingredients:
+        for user, tokens in queries:
             found = False
-            for recipe_ing in normalized:
-                if ingredient_matches(user_ing, recipe_ing):
+            for recipe_ing, clean_ing, recipe_tokens in zip(normalized, cleaned, token_sets):
+                if ingredient_matches(user, tokens, clean_ing, recipe_tokens):
                     found = True
                     matched.append(recipe_ing)
                     break
@@ -239,13 +519,16 @@ def find_matching_recipes(recipes, user_ingredients):
                 break
 
         if has_all:
-            other = [ing for ing in normalized if ing not in matched]
+            matched_set = set(matched)
+            other = [ing for ing in normalized if ing not in matched_set]
+            # Prebuild the ingredient badges so cached results render as-is
+            parts = [f'<span class="ingredient-have">✓ {ing}</span> ' for ing in matched]
+            parts.extend(f'<span class="ingredient-other">{ing}</span> ' for ing in other)
             results.append({
                 'name': recipe['name'],
                 'filename': recipe['filename'],
-                'matched': matched,
-                'other': other,
-                'total': len(normalized)
+                'total': len(normalized),
+                'ing_html': ''.join(parts)
             })
 
     # Sort alphabetically
@@ -253,32 +536,55 @@ def find_matching_recipes(recipes, user_ingredients):
     return results
 
 
-def display_pdf_from_bytes(pdf_bytes):
-    """Display PDF from bytes in Streamlit."""
+@st.cache_data(max_entries=256, show_spinner=False)
+def _find_matching_recipes_cached(user_ingredients, recipes_sig):
+    """Cached find_matching_recipes, keyed by a sorted ingredient tuple.
+
+    `recipes_sig` only ties the cache entry to the loaded recipe data.
+    """
+    recipes, vocab, matrix = load_search_index()
+    return find_matching_recipes(recipes, vocab, matrix, list(user_ingredients))
+
+
+def pdf_iframe_html(pdf_bytes):
+    """Wrap PDF bytes in an iframe using a base64 data URL."""
+    base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
+
+    return f'''
+        <iframe
+            src="data:application/pdf;base64,{base64_pdf}"
+            width="100%"
+            height="800"
+            type="application/pdf"
+            style="border: none; border-radius: 8px;">
+        </iframe>
+    '''
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def pdf_html_from_file(path_str, mtime):
+    """Read a local PDF and return it as iframe HTML.
+
+    `mtime` is only part of the cache key, so edited files are re-encoded.
+    """
+    with open(path_str, "rb") as f:
+        return pdf_iframe_html(f.read())
+
+
+def display_pdf_html(pdf_html):
+    """Display prebuilt PDF iframe HTML in Streamlit."""
     try:
-        base64_pdf = base64.b64encode(pdf_bytes).decode('utf-8')
-
-        pdf_display = f'''
-            <iframe
-                src="data:application/pdf;base64,{base64_pdf}"
-                width="100%"
-                height="800"
-                type="application/pdf"
-                style="border: none; border-radius: 8px;">
-            </iframe>
-        '''
-        st.markdown(pdf_display, unsafe_allow_html=True)
+        st.markdown(pdf_html, unsafe_allow_html=True)
         return True
     except Exception as e:
         st.error(f"Error displaying PDF: {e}")
         return False
 
 
-def display_pdf_from_file(pdf_path):
+def display_pdf_from_file(pdf_path, mtime):
     """Display PDF from local file in Streamlit."""
     try:
-        with open(pdf_path, "rb") as f:
-            return display_pdf_from_bytes(f.read())
+        return display_pdf_html(pdf_html_from_file(str(pdf_path), mtime))
     except Exception as e:
         st.error(f"Error loading PDF: {e}")
         return False
@@ -290,21 +596,20 @@ def display_recipe_pdf(filename):
     # Try OneDrive if configured
     if ONEDRIVE_SHARE_LINK:
         with st.spinner("Loading recipe from OneDrive..."):
-            pdf_bytes = fetch_pdf_from_onedrive(filename)
-            if pdf_bytes:
-                return display_pdf_from_bytes(pdf_bytes)
+            pdf_html = fetch_pdf_html_from_onedrive(filename)
+            if pdf_html:
+                return display_pdf_html(pdf_html)
             else:
                 st.warning("Could not load from OneDrive, trying local file...")
 
-    # Fallback to local file
-    pdf_path = Path(__file__).parent / PDF_FOLDER / filename
-    if pdf_path.exists():
-        return display_pdf_from_file(pdf_path)
-
-    # Try root folder
-    pdf_path_root = Path(__file__).parent / filename
-    if pdf_path_root.exists():
-        return display_pdf_from_file(pdf_path_root)
+    # Fallback to local file, then the root folder. A single stat() both
+    # checks that the file exists and gets the mtime for the PDF cache key.
+    for pdf_path in (_PDF_DIR / filename, _APP_DIR / filename):
+        try:
+            mtime = pdf_path.stat().st_mtime
+        except OSError:
+            continue
+        return display_pdf_from_file(pdf_path, mtime)
 
     # No PDF found
     st.error(f"PDF file not found: {filename}")
@@ -316,13 +621,60 @@ def display_recipe_pdf(filename):
     return False
 
 
+def add_ingredients(ingredients):
+    """Add ingredients to the search, skipping ones already present."""
+    added = False
+    for ing in ingredients:
+        if ing and ing not in st.session_state.ingredients:
+            st.session_state.ingredients.append(ing)
+            added = True
+    if added:
+        st.session_state.selected_recipe = None
+
+
+def add_typed_ingredient():
+    """Add the ingredient typed into the sidebar text box."""
+    add_ingredients([st.session_state.new_ingredient_input.lower()])
+
+
+def add_quick_picks():
+    """Add the ingredients picked in the Quick Add form."""
+    add_ingredients(st.session_state.quick_add_picks)
+
+
+def remove_picked_ingredients():
+    """Remove the ingredients picked in the Remove form."""
+    removals = st.session_state.remove_picks
+    if removals:
+        st.session_state.ingredients = [
+            ing for ing in st.session_state.ingredients if ing not in removals
+        ]
+        st.session_state.selected_recipe = None
+
+
+def clear_ingredients():
+    """Remove all ingredients from the search."""
+    st.session_state.ingredients = []
+    st.session_state.selected_recipe = None
+
+
+def select_recipe(recipe):
+    """Open a recipe's PDF, or go back to the results when None."""
+    st.session_state.selected_recipe = recipe
+
+
+def show_more_results():
+    """Reveal the next page of search results."""
+    st.session_state.results_shown += RESULTS_PAGE_SIZE
+
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🍳 Recipe Finder</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Search for recipes by ingredients</p>', unsafe_allow_html=True)
 
     # Load recipes
-    recipes = load_recipes()
+    recipes, _, _ = load_search_index()
 
     if not recipes:
         st.error("No recipes loaded. Please ensure recipes_data.json is in the same directory.")
@@ -339,7 +691,7 @@ def main():
         st.header("🥕 Your Ingredients")
 
         # Input for new ingredient
-        new_ingredient = st.text_input(
+        st.text_input(
             "Add an ingredient",
             placeholder="e.g., chicken, cheese...",
             key="new_ingredient_input"
@@ -347,45 +699,38 @@ def main():
 
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("➕ Add", use_container_width=True):
-                if new_ingredient and new_ingredient.lower() not in [i.lower() for i in st.session_state.ingredients]:
-                    st.session_state.ingredients.append(new_ingredient.lower())
-                    st.session_state.selected_recipe = None
-                    st.rerun()
+            st.button("➕ Add", on_click=add_typed_ingredient, use_container_width=True)
 
         with col2:
-            if st.button("🗑️ Clear", use_container_width=True):
-                st.session_state.ingredients = []
-                st.session_state.selected_recipe = None
-                st.rerun()
+            st.button("🗑️ Clear", on_click=clear_ingredients, use_container_width=True)
 
-        # Quick add buttons
-        st.markdown("**Quick Add:**")
+        # Quick add, batched in a form so picking several only reruns once
         common = ["chicken", "beef", "salmon", "pork", "rice", "pasta", "potato", "cheese", "garlic", "onion", "tomato", "eggs"]
 
-        cols = st.columns(3)
-        for i, ing in enumerate(common):
-            with cols[i % 3]:
-                if st.button(ing, key=f"quick_{ing}", use_container_width=True):
-                    if ing not in st.session_state.ingredients:
-                        st.session_state.ingredients.append(ing)
-                        st.session_state.selected_recipe = None
-                        st.rerun()
+        with st.form("quick_add", clear_on_submit=True):
+            st.multiselect(
+                "**Quick Add:**",
+                [ing for ing in common if ing not in st.session_state.ingredients],
+                placeholder="Pick common ingredients",
+                key="quick_add_picks"
+            )
+            st.form_submit_button("➕ Add selected", on_click=add_quick_picks, use_container_width=True)
 
         st.divider()
 
         # Show current ingredients
         if st.session_state.ingredients:
             st.markdown("**Your ingredients:**")
-            for ing in st.session_state.ingredients:
-                col_a, col_b = st.columns([3, 1])
-                with col_a:
-                    st.markdown(f"• {ing}")
-                with col_b:
-                    if st.button("✕", key=f"del_{ing}"):
-                        st.session_state.ingredients.remove(ing)
-                        st.session_state.selected_recipe = None
-                        st.rerun()
+            st.markdown("\n".join(f"- {ing}" for ing in st.session_state.ingredients))
+
+            with st.form("remove_ingredients", clear_on_submit=True):
+                st.multiselect(
+                    "Remove",
+                    st.session_state.ingredients,
+                    placeholder="Pick ingredients to remove",
+                    key="remove_picks"
+                )
+                st.form_submit_button("✕ Remove selected", on_click=remove_picked_ingredients, use_container_width=True)
         else:
             st.info("Add ingredients to search!")
 
@@ -410,9 +755,7 @@ def main():
         with col1:
             st.subheader(f"📖 {recipe['name']}")
         with col2:
-            if st.button("← Back to Results", use_container_width=True):
-                st.session_state.selected_recipe = None
-                st.rerun()
+            st.button("← Back to Results", on_click=select_recipe, args=(None,), use_container_width=True)
 
         # Display PDF (from OneDrive or local)
         display_recipe_pdf(recipe['filename'])
@@ -424,7 +767,14 @@ def main():
         if not st.session_state.ingredients:
             st.info("👈 Add ingredients in the sidebar to search for recipes!")
         else:
-            matches = find_matching_recipes(recipes, st.session_state.ingredients)
+            search_key = tuple(sorted(st.session_state.ingredients))
+            matches = _find_matching_recipes_cached(search_key, len(recipes))
+
+            # Start from the first page whenever the ingredients change
+            if st.session_state.get('results_for') != search_key:
+                st.session_state.results_for = search_key
+                st.session_state.results_shown = RESULTS_PAGE_SIZE
+            shown = st.session_state.results_shown
 
             if not matches:
                 search_terms = ", ".join(st.session_state.ingredients)
@@ -432,7 +782,7 @@ def main():
             else:
                 st.success(f"Found **{len(matches)}** recipe{'s' if len(matches) != 1 else ''} with all your ingredients!")
 
-                for i, recipe in enumerate(matches):
+                for i, recipe in enumerate(matches[:shown]):
                     with st.container():
                         col1, col2 = st.columns([4, 1])
 
@@ -440,21 +790,28 @@ def main():
                             st.markdown(f"**{recipe['name']}**")
 
                             # Show ingredients
-                            ing_html = ""
-                            for ing in recipe['matched']:
-                                ing_html += f'<span class="ingredient-have">✓ {ing}</span> '
-                            for ing in recipe['other']:
-                                ing_html += f'<span class="ingredient-other">{ing}</span> '
-
-                            st.markdown(ing_html, unsafe_allow_html=True)
+                            st.markdown(recipe['ing_html'], unsafe_allow_html=True)
 
                         with col2:
-                            if st.button("View Recipe", key=f"view_{i}", use_container_width=True):
-                                st.session_state.selected_recipe = recipe
-                                st.rerun()
+                            st.button(
+                                "View Recipe",
+                                key=f"view_{i}",
+                                on_click=select_recipe,
+                                args=(recipe,),
+                                use_container_width=True
+                            )
 
                         st.divider()
 
+                if len(matches) > shown:
+                    st.button(
+                        f"Show more ({len(matches) - shown} remaining)",
+                        on_click=show_more_results,
+                        use_container_width=True
+                    )
+
+                prefetch_recipe_pdfs(matches)
+
 
 if __name__ == "__main__":
     main()